@@ -1,14 +1,37 @@
 import os
 import json
 import time
+import asyncio
+import hashlib
 import logging
-from collections import defaultdict
+import logging.handlers
+import queue
+import sqlite3
+from functools import lru_cache
+from itertools import islice
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
 from pathlib import Path
-from openai import OpenAI
+import numpy as np
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 
 # ------------------------------------------------------------
 # Configuration
@@ -19,7 +42,17 @@ class Config:
     data_path: Path = Path("data/dev_turn.json")
     model_name: str = "gpt-4o"
     max_dialogues: Optional[int] = 100
-    sleep_between_calls: float = 1.0
+    max_concurrency: int = 10
+    # Conservative OpenAI usage-tier-1 limits for gpt-4o. A first-turn request
+    # here is ~1.8k estimated tokens, so 30k TPM allows only ~16 requests per
+    # minute whatever max_concurrency is. Accounts on higher tiers should raise
+    # these via OPENAI_REQUESTS_PER_MINUTE / OPENAI_TOKENS_PER_MINUTE.
+    requests_per_minute: int = 500
+    tokens_per_minute: int = 30000
+    max_retries: int = 5
+    retry_base_delay: float = 1.0
+    use_cache: bool = True
+    cache_path: Path = Path(".llm_cache.sqlite")
     results_file: Path = Path("results.txt")
     temperature: float = 0.1
     relative_tolerance: float = 1e-3
@@ -62,15 +95,20 @@ class JSONParsingError(Exception):
 # ------------------------------------------------------------
 # Logging Setup
 # ------------------------------------------------------------
-def setup_logging(log_file: Path) -> Tuple[logging.Logger, logging.FileHandler]:
+def setup_logging(log_file: Path) -> Tuple[logging.Logger, logging.handlers.QueueListener]:
     """
     Setup logging to both console and file.
     
+    The logger only enqueues records; a background listener thread writes
+    them to the console and file handlers, keeping disk I/O off the
+    evaluation loop. The listener is already started and must be stopped
+    to flush remaining records.
+    
     Args:
         log_file: Path to the log file
         
     Returns:
-        Tuple of (logger, file_handler)
+        Tuple of (logger, listener)
     """
     logger = logging.getLogger(__name__)
     logger.setLevel(logging.INFO)
@@ -91,10 +129,139 @@ def setup_logging(log_file: Path) -> Tuple[logging.Logger, logging.FileHandler]:
     console_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
     
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Queue feeding the background listener
+    log_queue: queue.Queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    
+    return logger, listener
+
+
+# ------------------------------------------------------------
+# Rate Limiting
+# ------------------------------------------------------------
+# Transient API errors retried by create_completion (APITimeoutError is a
+# subclass of APIConnectionError but is listed for clarity)
+RETRYABLE_API_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+class AsyncRateLimiter:
+    """Token-bucket rate limiter for requests and tokens per minute"""
+    
+    __slots__ = ("_request_capacity", "_token_capacity", "_available_requests",
+                 "_available_tokens", "_last_refill")
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Initialize the rate limiter with full buckets.
+        
+        Args:
+            requests_per_minute: Maximum number of requests per minute
+            tokens_per_minute: Maximum number of tokens per minute
+        """
+        self._request_capacity = float(requests_per_minute)
+        self._token_capacity = float(tokens_per_minute)
+        self._available_requests = self._request_capacity
+        self._available_tokens = self._token_capacity
+        self._last_refill = time.monotonic()
+    
+    def _refill(self) -> None:
+        """Refill both buckets according to the time elapsed since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._available_requests = min(
+            self._request_capacity,
+            self._available_requests + elapsed * self._request_capacity / 60.0
+        )
+        self._available_tokens = min(
+            self._token_capacity,
+            self._available_tokens + elapsed * self._token_capacity / 60.0
+        )
+    
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until capacity is available for one request of the given size.
+        
+        Args:
+            tokens: Estimated number of tokens the request will consume
+        """
+        # A request larger than the bucket could never be admitted otherwise
+        tokens = min(float(tokens), self._token_capacity)
+        while True:
+            self._refill()
+            if self._available_requests >= 1 and self._available_tokens >= tokens:
+                self._available_requests -= 1
+                self._available_tokens -= tokens
+                return
+            
+            request_wait = (1 - self._available_requests) * 60.0 / self._request_capacity
+            token_wait = (tokens - self._available_tokens) * 60.0 / self._token_capacity
+            await asyncio.sleep(max(request_wait, token_wait, 0.0))
+
+
+# ------------------------------------------------------------
+# Response Caching
+# ------------------------------------------------------------
+class ResponseCache:
+    """
+    Persistent exact-match cache of LLM responses backed by SQLite.
+    
+    Lookups and writes are synchronous and run on the event loop; they take
+    well under a millisecond, which is negligible next to an API call.
+    """
+    
+    __slots__ = ("_conn",)
+    
+    def __init__(self, path: Path):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            path: Path to the SQLite database file
+        """
+        self._conn = sqlite3.connect(str(path), isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+        )
+    
+    @staticmethod
+    def make_key(model_name: str, temperature: float,
+                 messages: List[Dict[str, str]]) -> str:
+        """
+        Build the cache key for a request.
+        
+        Args:
+            model_name: Model the request is sent to
+            temperature: Sampling temperature of the request
+            messages: Conversation history sent with the request
+            
+        Returns:
+            Hex SHA-256 digest identifying the request
+        """
+        payload = json.dumps([model_name, temperature, messages], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss"""
+        row = self._conn.execute(
+            "SELECT response FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key: str, response: str) -> None:
+        """Store the response for a key"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response)
+        )
     
-    return logger, file_handler
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._conn.close()
 
 
 # ------------------------------------------------------------
@@ -103,6 +270,8 @@ def setup_logging(log_file: Path) -> Tuple[logging.Logger, logging.FileHandler]:
 class ConversationMemory:
     """Manage conversation history for multi-turn dialogues"""
     
+    __slots__ = ("_history", "_system_prompt", "_system_message")
+    
     def __init__(self, system_prompt: Optional[str] = None):
         """
         Initialize conversation memory.
@@ -110,12 +279,26 @@ class ConversationMemory:
         Args:
             system_prompt: Optional system prompt to use for this conversation
         """
-        self._messages: List[Dict[str, str]] = []
-        self._system_prompt: Optional[str] = system_prompt
+        # System message (if any) at index 0, followed by the conversation
+        self._history: List[Dict[str, str]] = []
+        self._system_prompt: Optional[str] = None
+        self._system_message: Optional[Dict[str, str]] = None
+        if system_prompt:
+            self.set_system_prompt(system_prompt)
     
     def set_system_prompt(self, prompt: str) -> None:
         """Set the system prompt for this conversation"""
         self._system_prompt = prompt
+        # Built once so every turn sends the identical system message
+        system_message = {"role": "system", "content": prompt} if prompt else None
+        if self._system_message is not None:
+            if system_message is not None:
+                self._history[0] = system_message
+            else:
+                del self._history[0]
+        elif system_message is not None:
+            self._history.insert(0, system_message)
+        self._system_message = system_message
     
     def add_message(self, role: str, content: str) -> None:
         """
@@ -130,39 +313,48 @@ class ConversationMemory:
         """
         if role not in ("user", "assistant", "system"):
             raise ValueError(f"Invalid role: {role}. Must be 'user', 'assistant', or 'system'")
-        self._messages.append({"role": role, "content": content})
+        self._history.append({"role": role, "content": content})
     
     def add_user_message(self, message: str) -> None:
         """Add user message to memory"""
-        self.add_message("user", message)
+        # Role is known to be valid, so skip add_message's check
+        self._history.append({"role": "user", "content": message})
     
     def add_assistant_message(self, message: str) -> None:
         """Add assistant message to memory"""
-        self.add_message("assistant", message)
+        self._history.append({"role": "assistant", "content": message})
     
     def get_conversation_history(self) -> List[Dict[str, str]]:
-        """Get full conversation history including system prompt"""
-        history = []
-        if self._system_prompt:
-            history.append({"role": "system", "content": self._system_prompt})
-        return history + self._messages
+        """
+        Get full conversation history including system prompt.
+        
+        The internal list is returned without copying, so callers must
+        not modify it.
+        """
+        return self._history
     
     def clear(self) -> None:
         """Clear conversation memory"""
-        self._messages.clear()
+        self._history.clear()
         self._system_prompt = None
+        self._system_message = None
     
     def __len__(self) -> int:
-        """Return number of messages in memory"""
-        return len(self._messages)
+        """Return number of messages in memory, excluding the system prompt"""
+        return len(self._history) - (self._system_message is not None)
     
     def __repr__(self) -> str:
-        return f"ConversationMemory(messages={len(self._messages)}, has_system_prompt={self._system_prompt is not None})"
+        return f"ConversationMemory(messages={len(self)}, has_system_prompt={self._system_prompt is not None})"
 
 
 # ------------------------------------------------------------
 # Dialogue Processing
 # ------------------------------------------------------------
+def _turn_index(turn_data: Dict[str, Any]) -> int:
+    """Sort key returning the turn index of a dialogue entry"""
+    return turn_data["annotation"]["turn_ind"]
+
+
 class DialogueProcessor:
     """Process and organize dialogue data"""
     
@@ -177,33 +369,85 @@ class DialogueProcessor:
         Returns:
             Base dialogue ID without turn index (e.g., "dialogue_1")
         """
-        parts = full_id.split('_')
-        if parts[-1].isdigit():
-            return '_'.join(parts[:-1])
-        return full_id
+        head, sep, tail = full_id.rpartition('_')
+        return head if sep and tail.isdigit() else full_id
     
     @staticmethod
-    def group_by_dialogue(data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    def entries_are_contiguous(entry_ids: Iterable[str]) -> bool:
         """
-        Group data entries by dialogue ID and sort by turn.
+        Check whether the entries of each dialogue are contiguous.
         
         Args:
-            data: List of dialogue turn data
+            entry_ids: Full IDs of the data entries, in file order
             
         Returns:
-            Dictionary mapping dialogue IDs to sorted lists of turns
+            True if no dialogue's entries are interleaved with another's
+        """
+        current_id = None
+        finished_ids = set()
+        for entry_id in entry_ids:
+            dialogue_id = DialogueProcessor.extract_dialogue_id(entry_id)
+            if dialogue_id != current_id:
+                if dialogue_id in finished_ids:
+                    return False
+                if current_id is not None:
+                    finished_ids.add(current_id)
+                current_id = dialogue_id
+        return True
+    
+    @staticmethod
+    def group_by_dialogue(data: Iterable[Dict[str, Any]],
+                          contiguous: bool = True) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
         """
-        dialogues = defaultdict(list)
+        Group data entries by dialogue ID and sort by turn.
+        
+        When the entries of each dialogue are contiguous, as they are in the
+        dataset, each dialogue is emitted as soon as the next one starts and
+        only one dialogue is buffered at a time. Otherwise all entries are
+        buffered first and dialogues are emitted in order of first appearance.
+        
+        Args:
+            data: Iterable of dialogue turn data
+            contiguous: Whether each dialogue's entries are contiguous
+            
+        Yields:
+            Tuples of (dialogue ID, list of turns sorted by turn index)
+            
+        Raises:
+            ValueError: If contiguous is True but a dialogue's entries are not
+        """
+        if not contiguous:
+            dialogues: Dict[str, List[Dict[str, Any]]] = {}
+            for item in data:
+                dialogue_id = DialogueProcessor.extract_dialogue_id(item["id"])
+                dialogues.setdefault(dialogue_id, []).append(item)
+            for dialogue_id, turns in dialogues.items():
+                turns.sort(key=_turn_index)
+                yield dialogue_id, turns
+            return
+        
+        current_id = None
+        current_turns: List[Dict[str, Any]] = []
+        finished_ids = set()
         
         for item in data:
             dialogue_id = DialogueProcessor.extract_dialogue_id(item["id"])
-            dialogues[dialogue_id].append(item)
+            if dialogue_id != current_id:
+                if dialogue_id in finished_ids:
+                    raise ValueError(
+                        f"Entries of dialogue {dialogue_id} are not contiguous in the data"
+                    )
+                if current_turns:
+                    current_turns.sort(key=_turn_index)
+                    yield current_id, current_turns
+                    finished_ids.add(current_id)
+                current_id = dialogue_id
+                current_turns = []
+            current_turns.append(item)
         
-        # Sort each dialogue by turn_ind
-        for dialogue_id in dialogues:
-            dialogues[dialogue_id].sort(key=lambda x: x["annotation"]["turn_ind"])
-        
-        return dict(dialogues)
+        if current_turns:
+            current_turns.sort(key=_turn_index)
+            yield current_id, current_turns
     
     @staticmethod
     def extract_document_context(turn_data: Dict[str, Any]) -> str:
@@ -221,14 +465,11 @@ class DialogueProcessor:
         pre_text = annotation.get("amt_pre_text", "")
         post_text = annotation.get("amt_post_text", "")
         
-        return f"""Text before table:
-                {pre_text}
-
-                HTML Table:
-                {table_html}
-
-                Text after table:
-                {post_text}""".strip()
+        return "".join((
+            "Text before table:\n", pre_text,
+            "\n\nHTML Table:\n", table_html,
+            "\n\nText after table:\n", post_text,
+        )).strip()
     
     @staticmethod
     def extract_questions_and_answers(dialogue_turns: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
@@ -261,16 +502,32 @@ class DialogueProcessor:
 # ------------------------------------------------------------
 @dataclass
 class EvaluationResults:
-    """Track evaluation metrics"""
-    total_correct: int = 0
-    total_questions: int = 0
-    total_errors: int = 0
-    dialogue_results: List[Dict[str, Any]] = field(default_factory=list)
+    """Track evaluation metrics as parallel per-dialogue lists"""
+    ids: List[str] = field(default_factory=list)
+    correct: List[int] = field(default_factory=list)
+    total: List[int] = field(default_factory=list)
+    errors: List[int] = field(default_factory=list)
+    
+    @property
+    def total_correct(self) -> int:
+        """Total number of correct answers"""
+        return sum(self.correct)
+    
+    @property
+    def total_questions(self) -> int:
+        """Total number of questions"""
+        return sum(self.total)
+    
+    @property
+    def total_errors(self) -> int:
+        """Total number of errors"""
+        return sum(self.errors)
     
     @property
     def accuracy(self) -> float:
         """Calculate overall accuracy"""
-        return self.total_correct / self.total_questions if self.total_questions > 0 else 0.0
+        total_questions = self.total_questions
+        return self.total_correct / total_questions if total_questions > 0 else 0.0
     
     def add_dialogue_result(self, dialogue_id: str, correct: int, 
                            total: int, errors: int) -> None:
@@ -283,21 +540,41 @@ class EvaluationResults:
             total: Total number of questions
             errors: Number of errors encountered
         """
-        self.total_correct += correct
-        self.total_questions += total
-        self.total_errors += errors
-        self.dialogue_results.append({
-            "dialogue_id": dialogue_id,
-            "correct": correct,
-            "total": total,
-            "errors": errors,
-            "accuracy": correct / total if total > 0 else 0.0
-        })
+        self.ids.append(dialogue_id)
+        self.correct.append(correct)
+        self.total.append(total)
+        self.errors.append(errors)
+    
+    def to_numpy(self) -> Dict[str, np.ndarray]:
+        """
+        Get per-dialogue counts as arrays for vectorized aggregation.
+        
+        Returns:
+            Dictionary mapping "correct", "total" and "errors" to integer arrays
+        """
+        return {
+            "correct": np.asarray(self.correct, dtype=np.int64),
+            "total": np.asarray(self.total, dtype=np.int64),
+            "errors": np.asarray(self.errors, dtype=np.int64),
+        }
 
 
 # ------------------------------------------------------------
 # Answer Comparison
 # ------------------------------------------------------------
+# Characters stripped from answers before numeric conversion
+_STRIP_TABLE = str.maketrans('', '', ' $%')
+
+
+@lru_cache(maxsize=4096)
+def _parse_float(x_str: str) -> Optional[float]:
+    """Convert a cleaned answer string to float, or None if it is not numeric"""
+    try:
+        return float(x_str)
+    except ValueError:
+        return None
+
+
 def normalize_answer(x: Any) -> float:
     """
     Convert answer to float for numeric comparison.
@@ -310,13 +587,12 @@ def normalize_answer(x: Any) -> float:
     """
     if x is None:
         return 0.0
-    x_str = str(x).strip().lower()
-    x_str = x_str.replace(" ", "").replace("$", "").replace("%", "")
-    try:
-        return float(x_str)
-    except ValueError:
+    x_str = str(x).strip().lower().translate(_STRIP_TABLE)
+    value = _parse_float(x_str)
+    if value is None:
         print(f"Warning: Could not convert '{x}'")
         return 0.0
+    return value
 
 
 def answers_match(pred: Any, gold: Any, 
@@ -346,7 +622,10 @@ def answers_match(pred: Any, gold: Any,
 # ------------------------------------------------------------
 def parse_llm_response(response_text: str) -> Dict[str, Any]:
     """
-    Parse and clean LLM response, extracting JSON.
+    Parse LLM response as JSON.
+    
+    Responses are requested in JSON mode, so the text is raw JSON
+    without markdown code fences.
     
     Args:
         response_text: Raw response text from LLM
@@ -355,21 +634,15 @@ def parse_llm_response(response_text: str) -> Dict[str, Any]:
         Parsed JSON dictionary
         
     Raises:
-        JSONParsingError: If JSON parsing fails
+        JSONParsingError: If JSON parsing fails or the JSON is not an object
     """
     try:
-        # Strip markdown code blocks
-        cleaned = response_text.strip()
-        if cleaned.startswith('```json'):
-            cleaned = cleaned[7:]
-        if cleaned.startswith('```'):
-            cleaned = cleaned[3:]
-        if cleaned.endswith('```'):
-            cleaned = cleaned[:-3]
-        
-        return json.loads(cleaned.strip())
-    except json.JSONDecodeError as e:
+        result = orjson.loads(response_text)
+    except orjson.JSONDecodeError as e:
         raise JSONParsingError(f"Failed to parse JSON: {e}") from e
+    if not isinstance(result, dict):
+        raise JSONParsingError(f"Expected a JSON object, got {type(result).__name__}")
+    return result
 
 
 # ------------------------------------------------------------
@@ -388,57 +661,205 @@ class FinancialReasoningEvaluator:
         """
         self.config = config
         self.logger = logger
-        self.client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+        # create_completion retries transient errors itself, so the client must not
+        self.client = AsyncOpenAI(api_key=os.environ["OPENAI_API_KEY"], max_retries=0)
+        self.rate_limiter = AsyncRateLimiter(config.requests_per_minute,
+                                             config.tokens_per_minute)
+        self.cache = ResponseCache(config.cache_path) if config.use_cache else None
         self.processor = DialogueProcessor()
+        self._system_prompt_template = load_system_prompt()
     
-    def load_data(self) -> List[Dict[str, Any]]:
+    def load_data(self) -> Iterator[Dict[str, Any]]:
         """
-        Load evaluation data from JSON file.
+        Stream evaluation data from JSON file.
         
-        Returns:
-            List of dialogue turn data
+        Entries are parsed incrementally with ijson when it is installed,
+        otherwise the whole file is decoded at once.
+        
+        Yields:
+            Dialogue turn data entries
+        """
+        with open(self.config.data_path, 'rb') as f:
+            if ijson is None:
+                yield from orjson.loads(f.read())
+            else:
+                yield from ijson.items(f, 'item', use_float=True)
+    
+    def load_entry_ids(self) -> Iterator[str]:
+        """
+        Stream only the entry IDs from the JSON file.
+        
+        Yields:
+            Full entry IDs, in file order
         """
-        with open(self.config.data_path, encoding='utf-8') as f:
-            return json.load(f)
+        with open(self.config.data_path, 'rb') as f:
+            if ijson is None:
+                yield from (item["id"] for item in orjson.loads(f.read()))
+            else:
+                yield from ijson.items(f, 'item.id')
     
     def build_system_prompt(self, document_context: str) -> str:
         """
         Build complete system prompt with document context.
         
+        The result must stay byte-identical across the turns of a dialogue:
+        OpenAI prompt caching only applies to an exact prefix of at least
+        1024 tokens, so nothing dynamic (timestamps, turn counters) may be
+        added here. The static template comes first and the document
+        context follows it, ahead of the growing question/answer history.
+        
         Args:
             document_context: Financial document context to include
             
         Returns:
             Complete system prompt string
         """
-        system_prompt_template = load_system_prompt()
-        return f"""{system_prompt_template}
+        return f"""{self._system_prompt_template}
 
 Financial Document Content:
 {document_context}
 
 I will ask you multiple questions about this document. Please answer each question with the specified JSON format."""
     
-    def process_dialogue(self, document_context: str, 
+    async def create_completion(self, messages: List[Dict[str, str]]) -> Tuple[str, Optional[str]]:
+        """
+        Call the chat completions API under the rate limiter.
+        
+        Identical requests are answered from the response cache when it is
+        enabled (a synchronous SQLite lookup on the event loop). Fresh
+        responses are not cached here: the caller stores them with the
+        returned key once they have parsed, so a malformed reply is never
+        replayed on later runs. Rate-limit, connection, timeout and server
+        errors are retried with exponential backoff.
+        
+        Args:
+            messages: Conversation history to send
+            
+        Returns:
+            Tuple of (raw response text from the LLM, cache key to store the
+            response under, or None if it came from the cache or caching is off)
+            
+        Raises:
+            RateLimitError, APIConnectionError, InternalServerError: If the
+                request still fails after all retries
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ResponseCache.make_key(self.config.model_name,
+                                               self.config.temperature, messages)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached, None
+        
+        # Rough estimate of ~4 characters per token
+        estimated_tokens = len(json.dumps(messages)) // 4
+        
+        for attempt in range(self.config.max_retries + 1):
+            await self.rate_limiter.acquire(estimated_tokens)
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.config.model_name,
+                    messages=messages,
+                    temperature=self.config.temperature,
+                    response_format={"type": "json_object"}
+                )
+                return response.choices[0].message.content, cache_key
+            except RETRYABLE_API_ERRORS as e:
+                if attempt == self.config.max_retries:
+                    raise
+                delay = self.config.retry_base_delay * (2 ** attempt)
+                self.logger.warning("%s, retrying in %.1fs: %s", type(e).__name__, delay, e)
+                await asyncio.sleep(delay)
+    
+    def close(self) -> None:
+        """Release resources held by the evaluator"""
+        if self.cache is not None:
+            self.cache.close()
+    
+    def _score_and_log(self, turn_index: int, question: str, result: Dict[str, Any],
+                       pred: Any, gold: str, memory_size: int) -> Tuple[Dict[str, Any], str]:
+        """
+        Score a parsed turn against its gold answer and format its log entry.
+        
+        Args:
+            turn_index: Zero-based index of the turn
+            question: Question asked in this turn
+            result: Parsed LLM response
+            pred: Predicted answer extracted from the response
+            gold: Gold standard answer
+            memory_size: Number of messages in memory after this turn
+            
+        Returns:
+            Tuple of (response dictionary with the parsed result and match
+            flag, log text for the turn); scoring failures are recorded as
+            the turn's error
+        """
+        turn = turn_index + 1
+        try:
+            is_correct = answers_match(pred, gold, 
+                                      self.config.relative_tolerance,
+                                      self.config.absolute_tolerance)
+        except Exception as e:
+            return self._record_error(e, f"Scoring error for question {turn}: {e}")
+        
+        log_text = (
+            f"  Turn {turn}: Q: {question}\n"
+            f"  Turn {turn}: Pred: {pred}\n"
+            f"  Turn {turn}: Gold: {gold}\n"
+            f"  Turn {turn}: Match: {is_correct}\n"
+        )
+        # The full response can be long, so it is only included when debugging
+        if self.logger.isEnabledFor(logging.DEBUG):
+            log_text += f"  Turn {turn}: Details: {result}\n"
+        log_text += f"  Turn {turn}: Memory has {memory_size} messages\n"
+        
+        return {"result": result, "match": is_correct, "error": None}, log_text
+    
+    def _record_error(self, error: Exception, message: str,
+                      raw_response: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+        """
+        Record a failed turn and format its log entry.
+        
+        Args:
+            error: Exception raised while processing the turn
+            message: Error message to log
+            raw_response: Raw LLM response, if one was received
+            
+        Returns:
+            Tuple of (response dictionary recording the error, log text)
+        """
+        log_text = message
+        if raw_response is not None:
+            log_text += f"\nRaw response: {raw_response}"
+        return {"result": None, "match": False, "error": str(error)}, log_text
+    
+    async def process_dialogue(self, document_context: str, 
                         questions: List[str], 
-                        gold_answers: List[str]) -> List[Dict[str, Any]]:
+                        gold_answers: List[str],
+                        log_lines: List[str]) -> List[Dict[str, Any]]:
         """
         Process entire dialogue using conversation memory.
         
+        Turns are sent sequentially since each one depends on the
+        conversation history built up by the previous turns.
+        
         Args:
             document_context: Financial document context
             questions: List of questions to ask
             gold_answers: List of gold standard answers
+            log_lines: Dialogue log lines, extended with the per-turn output
             
         Returns:
-            List of response dictionaries for each question
+            List of per-question dictionaries with the parsed "result",
+            whether it "match"es the gold answer, and any "error" message
         """
         # Initialize conversation memory
         memory = ConversationMemory()
         system_prompt = self.build_system_prompt(document_context)
         memory.set_system_prompt(system_prompt)
         
-        responses = []
+        # (response, log text) for each turn, in turn order
+        turn_outcomes: List[Tuple[Dict[str, Any], str]] = []
         
         for i, question in enumerate(questions):
             try:
@@ -450,65 +871,61 @@ I will ask you multiple questions about this document. Please answer each questi
                 messages = memory.get_conversation_history()
                 
                 # Call OpenAI API
-                response = self.client.chat.completions.create(
-                    model=self.config.model_name,
-                    messages=messages,
-                    temperature=self.config.temperature
-                )
-                
-                response_text = response.choices[0].message.content
+                response_text, cache_key = await self.create_completion(messages)
                 if not response_text:
                     raise ValueError("Empty response from LLM API")
                 
                 # Parse JSON response
                 result = parse_llm_response(response_text)
-                responses.append(result)
+                
+                # Only cache replies that parsed to an object; messages is updated in place below
+                if cache_key is not None:
+                    self.cache.set(cache_key, response_text)
                 
                 # Add assistant response to memory
                 memory.add_assistant_message(response_text)
                 
-                # Show detailed output during processing
+                # Score and format detailed output
                 pred = result.get("answer", "")
-                gold = gold_answers[i]
-                is_correct = answers_match(pred, gold, 
-                                          self.config.relative_tolerance,
-                                          self.config.absolute_tolerance)
-                
-                self.logger.info(f"  Turn {i+1}: Q: {question}")
-                self.logger.info(f"  Turn {i+1}: Pred: {pred}")
-                self.logger.info(f"  Turn {i+1}: Gold: {gold}")
-                self.logger.info(f"  Turn {i+1}: Match: {is_correct}")
-                self.logger.info(f"  Turn {i+1}: Details: {result}")
-                self.logger.info(f"  Turn {i+1}: Memory has {len(memory)} messages")
-                self.logger.info("")
+                turn_outcomes.append(
+                    self._score_and_log(i, question, result, pred, gold_answers[i], len(memory))
+                )
                 
             except JSONParsingError as e:
-                self.logger.error(f"JSON parsing error for question {i+1}: {e}")
-                self.logger.error(f"Raw response: {response_text}")
-                responses.append({"error": str(e)})
+                turn_outcomes.append(self._record_error(
+                    e, f"JSON parsing error for question {i+1}: {e}", response_text
+                ))
                 memory.add_assistant_message(f"Error: {str(e)}")
                 
             except Exception as e:
-                self.logger.error(f"OpenAI API error for question {i+1}: {e}")
-                responses.append({"error": str(e)})
+                turn_outcomes.append(self._record_error(
+                    e, f"OpenAI API error for question {i+1}: {e}"
+                ))
                 memory.add_assistant_message(f"Error: {str(e)}")
-            
-            time.sleep(self.config.sleep_between_calls)
+        
+        responses = []
+        for response, log_text in turn_outcomes:
+            responses.append(response)
+            log_lines.append(log_text)
         
         # Print memory summary
-        self.logger.info(f"  Conversation memory contains {len(memory)} messages")
+        log_lines.append(f"  Conversation memory contains {len(memory)} messages")
         
         # Clear memory for next dialogue
         memory.clear()
-        self.logger.info("  Memory cleared for next dialogue")
+        log_lines.append("  Memory cleared for next dialogue")
         
         return responses
     
-    def evaluate_dialogue(self, dialogue_id: str, 
+    async def evaluate_dialogue(self, dialogue_id: str, 
                          dialogue_turns: List[Dict[str, Any]]) -> Tuple[int, int]:
         """
         Evaluate a single dialogue.
         
+        Dialogues run concurrently, so the dialogue's output is collected
+        and written as one log record once it finishes, keeping it
+        contiguous in the results file.
+        
         Args:
             dialogue_id: Identifier for the dialogue
             dialogue_turns: List of turns in the dialogue
@@ -516,66 +933,98 @@ I will ask you multiple questions about this document. Please answer each questi
         Returns:
             Tuple of (correct_count, error_count)
         """
-        self.logger.info(f"\n{'='*80}")
-        self.logger.info(f"Processing Dialogue: {dialogue_id}")
-        self.logger.info(f"Number of turns: {len(dialogue_turns)}")
-        self.logger.info(f"{'='*80}")
+        log_lines = [
+            f"\n{'='*80}",
+            f"Processing Dialogue: {dialogue_id}",
+            f"Number of turns: {len(dialogue_turns)}",
+            f"{'='*80}",
+        ]
         
         # Extract document context and questions
         document_context = self.processor.extract_document_context(dialogue_turns[0])
         questions, gold_answers = self.processor.extract_questions_and_answers(dialogue_turns)
         
         # Process entire conversation
-        self.logger.info(f"Starting conversation with {len(questions)} questions...")
-        responses = self.process_dialogue(document_context, questions, gold_answers)
+        log_lines.append(f"Starting conversation with {len(questions)} questions...")
+        responses = await self.process_dialogue(document_context, questions, gold_answers, log_lines)
         
-        # Evaluate each turn
-        dialogue_correct = 0
-        dialogue_errors = 0
+        # Tally turns already scored during processing
+        dialogue_correct = sum(r["match"] for r in responses)
+        dialogue_errors = sum(r["error"] is not None for r in responses)
         
-        for i, (response, gold) in enumerate(zip(responses, gold_answers)):
-            if "error" in response:
-                dialogue_errors += 1
-            else:
-                pred = response.get("answer", "")
-                if answers_match(pred, gold, 
-                               self.config.relative_tolerance,
-                               self.config.absolute_tolerance):
-                    dialogue_correct += 1
+        log_lines.append(f"Dialogue {dialogue_id} Results:")
+        log_lines.append(f"  Correct: {dialogue_correct}/{len(questions)}")
+        log_lines.append(f"  Errors: {dialogue_errors}")
+        log_lines.append(f"  Accuracy: {dialogue_correct/len(questions):.2%}")
         
-        self.logger.info(f"Dialogue {dialogue_id} Results:")
-        self.logger.info(f"  Correct: {dialogue_correct}/{len(questions)}")
-        self.logger.info(f"  Errors: {dialogue_errors}")
-        self.logger.info(f"  Accuracy: {dialogue_correct/len(questions):.2%}")
+        # Errors used to be logged at ERROR level, so keep that for the record
+        level = logging.ERROR if dialogue_errors else logging.INFO
+        self.logger.log(level, "%s", "\n".join(log_lines))
         
         return dialogue_correct, dialogue_errors
     
-    def evaluate(self) -> EvaluationResults:
+    async def _run_dialogue(self, semaphore: asyncio.Semaphore, dialogue_id: str,
+                            dialogue_turns: List[Dict[str, Any]]) -> Tuple[str, int, int, int]:
+        """
+        Evaluate a single dialogue and release its concurrency slot.
+        
+        Only the counts are returned so the dialogue turns can be freed
+        as soon as the dialogue has been evaluated.
+        
+        Args:
+            semaphore: Already-acquired semaphore bounding in-flight dialogues
+            dialogue_id: Identifier for the dialogue
+            dialogue_turns: List of turns in the dialogue
+            
+        Returns:
+            Tuple of (dialogue_id, turn_count, correct_count, error_count)
+        """
+        try:
+            correct, errors = await self.evaluate_dialogue(dialogue_id, dialogue_turns)
+            return dialogue_id, len(dialogue_turns), correct, errors
+        finally:
+            semaphore.release()
+    
+    async def evaluate(self) -> EvaluationResults:
         """
         Run full evaluation and return results.
         
+        Dialogues are independent of each other, so they are evaluated
+        concurrently, up to config.max_concurrency at a time. The dataset
+        is streamed, and the next dialogue is only read once a slot frees up.
+        
         Returns:
             EvaluationResults object with complete metrics
         """
-        # Load and process data
-        data = self.load_data()
-        dialogues = self.processor.group_by_dialogue(data)
-        dialogue_ids = list(dialogues.keys())
+        # Check the layout up front so an unsorted file never aborts a run midway
+        contiguous = self.processor.entries_are_contiguous(self.load_entry_ids())
+        if not contiguous:
+            self.logger.warning("Dialogue entries are not contiguous; buffering the whole dataset")
         
-        if self.config.max_dialogues is not None:
-            dialogue_ids = dialogue_ids[:self.config.max_dialogues]
+        # Stream and group data
+        data = self.load_data()
+        dialogues = islice(self.processor.group_by_dialogue(data, contiguous),
+                           self.config.max_dialogues)
         
         results = EvaluationResults()
         
+        # The dialogue count is only known once the stream is exhausted
         self.logger.info(f"Using OpenAI {self.config.model_name} with custom memory")
-        self.logger.info(f"Processing {len(dialogue_ids)} dialogues with memory management")
+        self.logger.info("Processing dialogues with memory management")
         self.logger.info(f"Results will be saved to: {self.config.results_file}")
         
-        # Evaluate each dialogue
-        for dialogue_id in dialogue_ids:
-            dialogue_turns = dialogues[dialogue_id]
-            correct, errors = self.evaluate_dialogue(dialogue_id, dialogue_turns)
-            results.add_dialogue_result(dialogue_id, correct, len(dialogue_turns), errors)
+        # Evaluate dialogues concurrently
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        tasks = []
+        for dialogue_id, dialogue_turns in dialogues:
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(
+                self._run_dialogue(semaphore, dialogue_id, dialogue_turns)
+            ))
+        dialogue_outcomes = await asyncio.gather(*tasks)
+        
+        for dialogue_id, total, correct, errors in dialogue_outcomes:
+            results.add_dialogue_result(dialogue_id, correct, total, errors)
         
         # Log final results
         self.logger.info(f"\n{'='*80}")
@@ -583,7 +1032,7 @@ I will ask you multiple questions about this document. Please answer each questi
         self.logger.info(f"{'='*80}")
         self.logger.info(f"OpenAI Model: {self.config.model_name}")
         self.logger.info(f"Memory Type: Custom ConversationMemory Class")
-        self.logger.info(f"Total Dialogues: {len(dialogue_ids)}")
+        self.logger.info(f"Total Dialogues: {len(dialogue_outcomes)}")
         self.logger.info(f"Total Questions: {results.total_questions}")
         self.logger.info(f"Total Correct: {results.total_correct}")
         self.logger.info(f"Total Errors: {results.total_errors}")
@@ -605,14 +1054,18 @@ def main() -> None:
     if "OPENAI_API_KEY" not in os.environ:
         raise RuntimeError("OPENAI_API_KEY environment variable not set.")
     
-    # Setup
-    config = Config()
-    logger, file_handler = setup_logging(config.results_file)
+    # Setup, with rate limits overridable to match the account's usage tier
+    config = Config(
+        requests_per_minute=int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", Config.requests_per_minute)),
+        tokens_per_minute=int(os.getenv("OPENAI_TOKENS_PER_MINUTE", Config.tokens_per_minute)),
+    )
+    logger, listener = setup_logging(config.results_file)
+    evaluator = None
     
     try:
         # Run evaluation
         evaluator = FinancialReasoningEvaluator(config, logger)
-        results = evaluator.evaluate()
+        results = asyncio.run(evaluator.evaluate())
         
         # Log completion
         logger.info(f"\nResults saved to: {config.results_file}")
@@ -622,9 +1075,13 @@ def main() -> None:
         raise
     finally:
         # Cleanup
-        if file_handler:
-            file_handler.close()
-            logger.removeHandler(file_handler)
+        if evaluator is not None:
+            evaluator.close()
+        if listener:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+            logger.handlers.clear()
 
 
 if __name__ == "__main__":